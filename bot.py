@@ -0,0 +1,61 @@
+import sys
+import time
+import random
+import hashlib
+
+from src.settings import *
+from src.world import World, Inputs, init_headless
+
+# --- BOT DE TRAYECTORIAS ---
+# Juega los 5 niveles sin ventana con entradas aleatorias de semilla fija y
+# resume en un hash todo lo que se movió tick a tick (jugador, ecos, gates,
+# fragmentos y portal). Si un cambio no debe alterar el juego, el hash tiene
+# que salir igual antes y después.
+#
+#   python bot.py [semilla] [positions|inputs]
+
+TICKS_PER_LEVEL = 3000
+
+
+def run(seed=1, echo_mode=ECHO_MODE, ticks=TICKS_PER_LEVEL):
+    rng = random.Random(seed)
+    world = World(echo_mode=echo_mode)
+    trajectory = hashlib.md5()
+    total = 0
+
+    start = time.perf_counter()
+    for level in range(1, TOTAL_LEVELS + 1):
+        world.reset_level(level)
+        for _ in range(ticks):
+            inputs = Inputs(
+                move=rng.choice([0, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP,
+                                 INPUT_LEFT | INPUT_JUMP, INPUT_RIGHT | INPUT_JUMP]),
+                spawn_echo=rng.random() < 0.01,
+                clear_echoes=rng.random() < 0.002,
+                dismiss_popup=rng.random() < 0.05,
+            )
+            result = world.step(inputs)
+            total += 1
+            # Siempre se juega el mismo nivel: al salir por el portal se vuelve a empezar
+            if result == "finished" or world.current_level != level:
+                world.reset_level(level)
+
+            state = (world.player.rect.topleft,
+                     [e.rect.topleft for e in world.echoes],
+                     [g.rect.y for g in world.gates],
+                     world.collected_fragments,
+                     world.portal.active)
+            trajectory.update(repr(state).encode())
+    elapsed = time.perf_counter() - start
+
+    world.levels.shutdown()
+    return trajectory.hexdigest()[:12], total / elapsed
+
+
+if __name__ == "__main__":
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    echo_mode = sys.argv[2] if len(sys.argv) > 2 else ECHO_MODE
+
+    init_headless()
+    digest, ticks_per_second = run(seed, echo_mode)
+    print(f"Trayectoria: {digest} ({int(ticks_per_second)} ticks/s, semilla {seed}, ecos '{echo_mode}')")
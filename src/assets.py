@@ -1,8 +1,29 @@
 import pygame
 import os
+import io
+
+# Carpeta raíz de los assets (independiente del directorio de trabajo)
+ASSETS_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
 
 class AssetManager:
+    # --- MANIFIESTO DE ARCHIVOS ---
+    # Se escanea assets/ una sola vez. Clave: ruta relativa en minúsculas
+    # ("assets/images/piso.png"), valor: ruta real en disco. Así "images" e
+    # "Images" resuelven igual y las rutas inexistentes no tocan el disco.
+    _manifest = None
+    _missing = set()
+
+    # --- CACHÉ DE IMÁGENES (compartida por todo el proceso) ---
+    # Clave: (ruta real, tamaño, alpha). Cada tamaño pedido se decodifica y escala una sola vez,
+    # así reiniciar un nivel no vuelve a tocar el disco ni el decodificador.
+    # Las superficies son compartidas: quien necesite modificarlas debe usar .copy()
+    _image_cache = {}
+    cache_hits = 0
+    cache_misses = 0
+
     def __init__(self):
+        self.build_manifest()
+
         # Inicializamos el sistema de sonido
         try:
             pygame.mixer.init()
@@ -26,8 +47,104 @@ class AssetManager:
         self.current_track = None
         self.music_volume = 0.4
 
+        # Pistas leídas por adelantado (clave -> bytes del archivo), ver prefetch_music
+        self._music_bytes = {}
+        self._music_stream = None # El BytesIO de la pista en curso debe seguir vivo
+
+    @classmethod
+    def build_manifest(cls):
+        if cls._manifest is not None:
+            return cls._manifest
+
+        manifest = {}
+        parent = os.path.dirname(ASSETS_ROOT)
+        for folder, _, files in os.walk(ASSETS_ROOT):
+            for name in files:
+                real_path = os.path.join(folder, name)
+                key = os.path.relpath(real_path, parent).replace(os.sep, "/").lower()
+                manifest[key] = real_path
+
+        cls._manifest = manifest
+        print(f"Manifiesto de assets: {len(manifest)} archivos indexados.")
+        return manifest
+
+    @classmethod
+    def resolve(cls, path):
+        """Traduce una ruta 'assets/...' a la real en disco sin tocar el sistema de archivos"""
+        key = path.replace("\\", "/").lower()
+        if key.startswith("./"):
+            key = key[2:]
+
+        if key in cls._missing:
+            raise FileNotFoundError(path)
+
+        manifest = cls._manifest if cls._manifest is not None else cls.build_manifest()
+        real_path = manifest.get(key)
+        if real_path is None:
+            # Lo anotamos para que el siguiente intento falle sin buscar de nuevo
+            cls._missing.add(key)
+            raise FileNotFoundError(path)
+        return real_path
+
+    @classmethod
+    def load_image(cls, path, size=None, alpha=True):
+        """Devuelve la imagen decodificada (y escalada si se pide) desde la caché"""
+        # Lanza FileNotFoundError si no existe (los sprites tienen su fallback)
+        real_path = cls.resolve(path)
+        key = (real_path, size, alpha)
+        surface = cls._image_cache.get(key)
+        if surface is not None:
+            cls.cache_hits += 1
+            return surface
+
+        cls.cache_misses += 1
+        if size is not None:
+            # Solo se guarda la versión escalada: el original a tamaño completo
+            # (un fondo de 1920x1080 son 8 MB) no se queda en caché salvo que
+            # alguien lo pida con size=None
+            original = cls._image_cache.get((real_path, None, alpha))
+            if original is None:
+                raw = pygame.image.load(real_path)
+                original = raw.convert_alpha() if alpha else raw.convert()
+            surface = pygame.transform.scale(original, size)
+        else:
+            raw = pygame.image.load(real_path)
+            surface = raw.convert_alpha() if alpha else raw.convert()
+
+        cls._image_cache[key] = surface
+        return surface
+
+    @classmethod
+    def cache_stats(cls):
+        return {
+            "hits": cls.cache_hits,
+            "misses": cls.cache_misses,
+            "entries": len(cls._image_cache),
+            "missing": len(cls._missing)
+        }
+
+    @classmethod
+    def clear_cache(cls):
+        cls._image_cache.clear()
+        cls.cache_hits = 0
+        cls.cache_misses = 0
+
+    def prefetch_music(self, track_key):
+        """Lee la pista a memoria (pensado para un hilo de fondo).
+
+        Así play_music no tiene que ir al disco al cambiar de nivel.
+        """
+        path = self.music_tracks.get(track_key)
+        if not path or track_key in self._music_bytes:
+            return
+        try:
+            with open(self.resolve(path), "rb") as f:
+                self._music_bytes[track_key] = f.read()
+        except OSError:
+            pass # play_music avisará del error si de verdad se intenta reproducir
+
     def play_music(self, track_key):
-        """Gestiona el cambio de música inteligente con fadeout"""
+        """Gestiona el cambio de música (entra con fade in, sin bloquear)"""
         # 1. Si ya está sonando esa canción, no hacer nada
         if self.current_track == track_key:
             return
@@ -40,19 +157,26 @@ class AssetManager:
 
         # 3. Intentar cargar y reproducir
         try:
-            # Si hay música sonando, hacemos un fadeout suave
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.fadeout(500)
-            
-            pygame.mixer.music.load(path)
+            # Nada de fadeout() antes de cargar: SDL_mixer espera a que
+            # termine el fade para empezar la siguiente pista y el juego se
+            # quedaba medio segundo congelado. load() corta la anterior y la
+            # nueva entra con fade in.
+            data = self._music_bytes.pop(track_key, None)
+            if data is not None:
+                stream = io.BytesIO(data)
+                pygame.mixer.music.load(stream, os.path.splitext(path)[1][1:])
+                self._music_stream = stream
+            else:
+                pygame.mixer.music.load(self.resolve(path))
+                self._music_stream = None
             pygame.mixer.music.set_volume(self.music_volume)
-            pygame.mixer.music.play(-1) # Loop infinito
+            pygame.mixer.music.play(-1, fade_ms=500) # Loop infinito
             
             self.current_track = track_key
             print(f"Reproduciendo música: {track_key} -> {path}")
             
-        except pygame.error as e:
+        except (pygame.error, FileNotFoundError) as e:
             print(f"Error al cargar música ({path}): {e}")
 
     def stop_music(self):
-        pygame.mixer.music.stop()
\ No newline at end of file
+        pygame.mixer.music.stop()
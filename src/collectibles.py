@@ -1,13 +1,15 @@
 import pygame
 from src.settings import *
+from src.assets import AssetManager
 
 class Crystal(pygame.sprite.Sprite):
+    trigger = "pickup" # Evento al tocarlo el jugador (ver World.check_triggers)
+
     def __init__(self, x, y):
         super().__init__()
         try:
-            img = pygame.image.load('assets/images/soul_fragment.png').convert_alpha()
             # --- CAMBIO: AUMENTO DE TAMAÑO (Antes 24x24) ---
-            self.image = pygame.transform.scale(img, (40, 40))
+            self.image = AssetManager.load_image('assets/images/soul_fragment.png', (40, 40))
         except FileNotFoundError:
             # Fallback más grande también
             self.image = pygame.Surface((40, 40), pygame.SRCALPHA)
@@ -16,20 +18,25 @@ class Crystal(pygame.sprite.Sprite):
         
         self.rect = self.image.get_rect(center=(x, y))
 
+    def snapshot(self):
+        return self.rect.center
+
+    def restore(self, state):
+        self.rect.center = state
+
 class Portal(pygame.sprite.Sprite):
+    trigger = "exit"
+
     def __init__(self, x, y):
         super().__init__()
         self.images = {}
         try:
-            closed = pygame.image.load('assets/images/portal_closed.png').convert_alpha()
-            opened = pygame.image.load('assets/images/portal_open.png').convert_alpha()
-            
             # --- CAMBIO: AUMENTO DE TAMAÑO (Antes 64x96) ---
             # Ahora son mucho más altos y anchos
             new_size = (100, 150)
             
-            self.images['closed'] = pygame.transform.scale(closed, new_size)
-            self.images['open'] = pygame.transform.scale(opened, new_size)
+            self.images['closed'] = AssetManager.load_image('assets/images/portal_closed.png', new_size)
+            self.images['open'] = AssetManager.load_image('assets/images/portal_open.png', new_size)
             self.image = self.images['closed']
         except FileNotFoundError:
             # Fallback grande
@@ -42,8 +49,23 @@ class Portal(pygame.sprite.Sprite):
         self.active = False 
 
     def activate(self):
+        if self.active:
+            return
         self.active = True
         if self.images:
             self.image = self.images['open']
         else:
-            self.image.fill(COLOR_ECHO)
\ No newline at end of file
+            # Copia: la superficie cerrada sigue en el snapshot del nivel
+            self.image = self.image.copy()
+            self.image.fill(COLOR_ECHO)
+
+    def close(self):
+        self.active = False
+        if self.images:
+            self.image = self.images['closed']
+
+    def snapshot(self):
+        return self.active, self.image
+
+    def restore(self, state):
+        self.active, self.image = state
@@ -0,0 +1,99 @@
+from src.settings import *
+
+class SpatialHash:
+    """Rejilla uniforme para la fase amplia de colisiones.
+
+    Cada sprite se guarda en las celdas que toca su rect. Lo estático se
+    inserta una vez al cargar el nivel; lo que se mueve o se activa
+    (gates, barreras) se actualiza con move()/remove()/insert(). Una
+    consulta solo mira las celdas del rect consultado, así que el coste
+    depende de lo que hay cerca y no del tamaño del nivel.
+    """
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}    # (cx, cy) -> set de sprites
+        self.entries = {}  # sprite -> (celdas, orden de inserción)
+        self._serial = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, sprite):
+        return sprite in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        x0 = rect.left // size
+        x1 = (rect.right - 1) // size
+        y0 = rect.top // size
+        y1 = (rect.bottom - 1) // size
+        return tuple((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+
+    def insert(self, sprite):
+        if sprite in self.entries:
+            self.move(sprite)
+            return
+        cells = self._cells_for(sprite.rect)
+        for cell in cells:
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                bucket = self.cells[cell] = set()
+            bucket.add(sprite)
+        self._serial += 1
+        self.entries[sprite] = (cells, self._serial)
+
+    def remove(self, sprite):
+        entry = self.entries.pop(sprite, None)
+        if entry is None:
+            return
+        for cell in entry[0]:
+            bucket = self.cells[cell]
+            bucket.discard(sprite)
+            if not bucket:
+                del self.cells[cell]
+
+    def move(self, sprite):
+        """Re-ubica un sprite tras cambiar su rect (solo si cambió de celdas)"""
+        entry = self.entries.get(sprite)
+        if entry is None:
+            return
+        old_cells, serial = entry
+        new_cells = self._cells_for(sprite.rect)
+        if new_cells == old_cells:
+            return
+        for cell in old_cells:
+            bucket = self.cells[cell]
+            bucket.discard(sprite)
+            if not bucket:
+                del self.cells[cell]
+        for cell in new_cells:
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                bucket = self.cells[cell] = set()
+            bucket.add(sprite)
+        self.entries[sprite] = (new_cells, serial)
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+
+    def query(self, rect):
+        """Sprites cuyo rect choca con 'rect', en orden de inserción"""
+        size = self.cell_size
+        cells = self.cells
+        found = set()
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+
+        hits = [s for s in found if rect.colliderect(s.rect)]
+        if len(hits) > 1:
+            # Mismo orden que spritecollide sobre un Group: el de inserción
+            entries = self.entries
+            hits.sort(key=lambda s: entries[s][1])
+        return hits
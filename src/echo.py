@@ -0,0 +1,152 @@
+from src.settings import *
+from src.player import Player, Recording, InputRecording, FLAG_FACING_RIGHT, FLAG_ON_GROUND
+
+class EchoPool:
+    """Reserva de ecos y tomas reutilizables.
+
+    Borrar los ecos (C) o reiniciar el nivel devuelve los sprites y sus
+    Recording aquí en lugar de tirarlos; el siguiente eco (Z) y la
+    siguiente toma del jugador salen de la reserva, así los ciclos de
+    grabar/borrar no generan basura ni pausas del GC a mitad de nivel.
+    """
+    def __init__(self, capacity=ECHO_POOL_SIZE, mode=ECHO_MODE):
+        if mode not in ("positions", "inputs"):
+            raise ValueError(f"Modo de eco desconocido: {mode}")
+        self.capacity = capacity
+        self.mode = mode # Tipo de toma que se entrega (ver ECHO_MODE)
+        self.free_echoes = []
+        self.free_recordings = []
+
+        # Estadísticas
+        self.created = 0
+        self.reused = 0
+        self.recordings_created = 0
+        self.recordings_reused = 0
+
+    def prewarm(self):
+        """Crea de antemano los ecos que faltan para llenar la reserva"""
+        while len(self.free_echoes) < self.capacity:
+            self.free_echoes.append(Player(0, 0, is_echo=True))
+            self.created += 1
+
+    def acquire(self, x, y):
+        if self.free_echoes:
+            echo = self.free_echoes.pop()
+            self.reused += 1
+        else:
+            echo = Player(x, y, is_echo=True)
+            self.created += 1
+        echo.reset_state(x, y)
+        return echo
+
+    def release(self, echo):
+        echo.kill()
+        echo.set_ground(None) # Que ningún gate siga llevándolo
+        self.release_recording(echo.recording)
+        echo.recording = None
+        if len(self.free_echoes) < self.capacity:
+            self.free_echoes.append(echo)
+
+    def take_recording(self):
+        if self.free_recordings:
+            self.recordings_reused += 1
+            return self.free_recordings.pop()
+        self.recordings_created += 1
+        return InputRecording() if self.mode == "inputs" else Recording()
+
+    def release_recording(self, recording):
+        # Una toma de más por si el jugador está grabando mientras se borran
+        if recording is not None and len(self.free_recordings) <= self.capacity:
+            recording.clear()
+            self.free_recordings.append(recording)
+
+    def stats(self):
+        return {
+            "echoes_created": self.created,
+            "echoes_reused": self.reused,
+            "echoes_free": len(self.free_echoes),
+            "recordings_created": self.recordings_created,
+            "recordings_reused": self.recordings_reused,
+            "recordings_free": len(self.free_recordings),
+        }
+
+
+class EchoSystem:
+    """Reproduce las tomas de todos los ecos en un único paso por tick.
+
+    Los ecos siguen siendo sprites Player (para dibujarlos y para la
+    resonancia), pero su avance ya no pasa por Player.update: aquí se lee
+    cada toma por índice en un solo bucle, y los ecos que terminaron su
+    toma salen de la lista de reproducción y dejan de costar.
+
+    Con un Recording el eco copia la posición grabada; con un
+    InputRecording se le aplica la entrada grabada con Player.move, así que
+    choca, se sube a los gates y acciona palancas según el nivel de ahora.
+    """
+    def __init__(self, pool=None):
+        self.pool = pool or EchoPool()
+        self.echoes = []     # Todos los ecos del nivel (los que se dibujan)
+        self._playing = []   # Solo los que aún tienen ticks por reproducir
+
+    def __len__(self):
+        return len(self.echoes)
+
+    def spawn(self, x, y, recording):
+        """Saca un eco de la reserva y le entrega la toma a reproducir"""
+        echo = self.pool.acquire(x, y)
+        echo.recording = recording
+        self.add(echo)
+        return echo
+
+    def add(self, echo):
+        echo.playback_index = 0
+        echo.finished_playback = False
+        self.echoes.append(echo)
+        self._playing.append(echo)
+
+    def clear(self):
+        # Los ecos (y sus tomas) vuelven a la reserva
+        for e in self.echoes: self.pool.release(e)
+        self.echoes.clear()
+        self._playing.clear()
+
+    def step(self, colliders=None):
+        playing = self._playing
+        alive = 0
+        for echo in playing:
+            rec = echo.recording
+            i = echo.playback_index
+            if i >= len(rec):
+                echo.finished_playback = True
+                # Se queda quieto donde acabó: si es sobre un gate, viaja con él
+                if colliders is not None:
+                    echo.find_ground(colliders)
+                continue
+
+            if rec.mode == "inputs":
+                if i == 0:
+                    rec.start(echo)
+                echo.move(colliders, rec.inputs[i])
+                echo.playback_index = i + 1
+                if echo.rect.y > SCREEN_HEIGHT + 200:
+                    # Se cayó del nivel: ya no hay nada que simular
+                    echo.finished_playback = True
+                    continue
+                playing[alive] = echo
+                alive += 1
+                continue
+
+            rect = echo.rect
+            rect.x = rec.xs[i]
+            rect.y = rec.ys[i]
+            flags = rec.flags[i]
+            echo.facing_right = flags & FLAG_FACING_RIGHT != 0
+            echo.on_ground = flags & FLAG_ON_GROUND != 0
+            echo.velocity.x = rec.vxs[i]
+            echo.animate()
+            echo.playback_index = i + 1
+
+            # Compactamos la lista en el sitio (sin crear una nueva por tick)
+            playing[alive] = echo
+            alive += 1
+        del playing[alive:]
@@ -0,0 +1,57 @@
+import pygame
+from src.settings import *
+
+class HUD:
+    """Panel de nivel/ecos y popup del tutorial.
+
+    Los paneles se crean una sola vez y los textos solo se vuelven a
+    renderizar cuando cambia lo que muestran (nivel, fragmentos o texto
+    del popup), no en cada frame.
+    """
+    def __init__(self, font, world):
+        self.font = font
+        self.world = world
+
+        # Superficies fijas
+        self.panel = pygame.Surface((350, 40))
+        self.panel.set_alpha(180)
+        self.panel.fill((0, 0, 0))
+
+        self.popup_panel = pygame.Surface((SCREEN_WIDTH, 80))
+        self.popup_panel.set_alpha(220)
+        self.popup_panel.fill((10, 10, 20))
+        self.popup_panel.set_colorkey((0,0,0))
+        pygame.draw.rect(self.popup_panel, COLOR_PLAYER, (0,0, SCREEN_WIDTH, 80), 2)
+
+        # Textos memorizados: (clave, superficie)
+        self._info = (None, None)
+        self._popup = (None, None)
+
+    def info_surface(self):
+        world = self.world
+        key = (world.current_level, world.collected_fragments)
+        if self._info[0] != key:
+            if world.current_level == 1:
+                info_text = f"NIVEL {world.current_level} | CRISTALES: {world.collected_fragments}/3"
+            else:
+                info_text = f"NIVEL {world.current_level} | ECOS: {world.collected_fragments}"
+            self._info = (key, self.font.render(info_text, True, COLOR_ECHO))
+        return self._info[1]
+
+    def popup_surface(self):
+        text = self.world.popup_text
+        if self._popup[0] != text:
+            self._popup = (text, self.font.render(text, True, (255, 255, 255)))
+        return self._popup[1]
+
+    def draw(self, surface):
+        """Dibuja el HUD y devuelve las zonas de pantalla que ocupa"""
+        rects = [surface.blit(self.panel, (10, 10))]
+        rects.append(surface.blit(self.info_surface(), (20, 20)))
+
+        if self.world.show_popup:
+            rects.append(surface.blit(self.popup_panel, (0, 60)))
+            pop_text_surf = self.popup_surface()
+            pop_rect = pop_text_surf.get_rect(center=(SCREEN_WIDTH//2, 100))
+            rects.append(surface.blit(pop_text_surf, pop_rect))
+        return rects
@@ -0,0 +1,285 @@
+import os
+import json
+import pickle
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from src.settings import *
+from src.assets import AssetManager, ASSETS_ROOT
+from src.platform import Platform
+from src.collectibles import Crystal, Portal
+from src.player import Player
+from src.mechanics import Lever, Gate, Spike, Barrier
+from src.rules import RULE_TARGETS, compile_condition, resolve
+from src.sensors import merge_hazards
+
+# Niveles compilados: assets/levels/__cache__/levelN.<hash>.pickle
+CACHE_DIR = os.path.join(ASSETS_ROOT, "levels", "__cache__")
+
+# Subir si cambia lo que produce compile_level (invalida las cachés viejas)
+LEVEL_FORMAT = 2
+
+# tipo -> (clase, campos obligatorios, campos opcionales con su nombre en el constructor)
+ENTITY_TYPES = {
+    "platform": (Platform, ("x", "y"), {"kind": "type", "width": "width", "is_resonance": "is_resonance",
+                                        "resonance_chain": "resonance_chain"}),
+    "gate":     (Gate, ("x", "y"), {"width": "width", "height": "height", "move_y": "move_y",
+                                    "color": "color", "loop": "loop", "fill": "fill"}),
+    "spike":    (Spike, ("x", "y"), {"width": "width"}),
+    "lever":    (Lever, ("x", "y"), {}),
+    "crystal":  (Crystal, ("x", "y"), {}),
+    "barrier":  (Barrier, ("x", "y", "width", "height", "color"), {}),
+    "portal":   (Portal, ("x", "y"), {}),
+    "player":   (Player, ("x", "y"), {}),
+}
+
+# Grupo de World al que va cada tipo (además de all_sprites)
+ENTITY_GROUPS = {"platform": 0, "crystal": 1, "lever": 2, "gate": 3}
+
+
+def compile_level(data, name="nivel"):
+    """Valida un nivel ya leído del JSON y lo deja listo para construir.
+
+    Las entidades quedan como (tipo, id, kwargs del constructor) en el orden
+    del archivo (que es el orden de dibujo) y las referencias por id
+    (moving_gate, moving_crystal y las de las reglas) pasan a ser índices.
+    """
+    entities = []
+    ids = {}
+    for i, entry in enumerate(data.get("entities", [])):
+        kind = entry.get("type")
+        if kind not in ENTITY_TYPES:
+            raise ValueError(f"{name}: entidad {i} de tipo desconocido '{kind}'")
+        _, required, optional = ENTITY_TYPES[kind]
+
+        kwargs = {}
+        for field in required:
+            if field not in entry:
+                raise ValueError(f"{name}: a la entidad {i} ({kind}) le falta '{field}'")
+            kwargs[field] = entry[field]
+        for field, arg in optional.items():
+            if field in entry:
+                kwargs[arg] = entry[field]
+        for key in entry:
+            if key not in required and key not in optional and key not in ("type", "id"):
+                raise ValueError(f"{name}: campo '{key}' no válido para {kind}")
+
+        # Los colores llegan como listas JSON; pygame los quiere en tupla
+        for arg in ("color", "fill"):
+            if arg in kwargs:
+                kwargs[arg] = tuple(kwargs[arg])
+
+        ident = entry.get("id")
+        if kind == "barrier" and ident is None:
+            raise ValueError(f"{name}: la barrera {i} necesita un 'id'")
+        if ident is not None:
+            if ident in ids:
+                raise ValueError(f"{name}: id repetido '{ident}'")
+            ids[ident] = i
+        entities.append((kind, ident, kwargs))
+
+    kinds = [e[0] for e in entities]
+    for kind in ("player", "portal"):
+        if kinds.count(kind) != 1:
+            raise ValueError(f"{name}: debe haber exactamente un '{kind}'")
+
+    def ref(ident, kind):
+        if ident is None:
+            return None
+        index = ids.get(ident)
+        if index is None or entities[index][0] != kind:
+            raise ValueError(f"{name}: '{ident}' no es un {kind} del nivel")
+        return index
+
+    portal = kinds.index("portal")
+    rules = []
+    for rule in data.get("rules", []):
+        target = rule.get("open")
+        index = portal if target == "portal" else ids.get(target)
+        if index is None or entities[index][0] not in RULE_TARGETS:
+            raise ValueError(f"{name}: la regla abre '{target}', que no es barrera, gate ni portal")
+        if "when" not in rule:
+            raise ValueError(f"{name}: a la regla de '{target}' le falta 'when'")
+        when = compile_condition(rule["when"], lambda ident: ref(ident, "lever"), name)
+        rules.append((entities[index][0], index, when))
+
+    popup = data.get("popup", {})
+    return {
+        "format": LEVEL_FORMAT,
+        "entities": entities,
+        "tutorial_step": popup.get("tutorial_step", 0),
+        "popup_text": popup.get("text", ""),
+        "show_popup": popup.get("show", False),
+        "moving_gate": ref(data.get("moving_gate"), "gate"),
+        "moving_crystal": ref(data.get("moving_crystal"), "crystal"),
+        "rules": rules,
+    }
+
+
+class LevelManager:
+    """Carga los niveles declarados en assets/levels/levelN.json.
+
+    La primera vez que se ve un archivo se valida y compila, y el resultado
+    se guarda en __cache__ con el hash del JSON en el nombre; las siguientes
+    ejecuciones leen directamente ese pickle. Dentro de una misma ejecución
+    cada nivel compilado se queda en memoria (reiniciar tras morir no lee nada).
+    """
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.compiled = {}  # level_id -> nivel compilado
+        self.pending = {}   # level_id -> Future del prefetch en curso
+        self._executor = None
+
+        # Estadísticas
+        self.compiles = 0
+        self.cache_loads = 0
+
+    def level_path(self, level_id):
+        return AssetManager.resolve(f"assets/levels/level{level_id}.json")
+
+    def get(self, level_id):
+        future = self.pending.pop(level_id, None)
+        if future is not None:
+            # Normalmente ya terminó; si no, esperar es más corto que repetirlo
+            # (y así nunca se construyen sprites en los dos hilos a la vez)
+            compiled = future.result()
+            if compiled is not None:
+                self.compiled[level_id] = compiled
+
+        compiled = self.compiled.get(level_id)
+        if compiled is None:
+            compiled = self.compiled[level_id] = self.load_compiled(level_id)
+        return compiled
+
+    def prefetch(self, level_id, assets=None):
+        """Prepara en segundo plano el nivel level_id mientras se juega el actual.
+
+        En un hilo aparte se compila (o lee de la caché) el nivel, se
+        construyen sus sprites una vez para llenar las cachés de imágenes,
+        animaciones y teñido de barreras, y se lee su música a memoria. Al
+        entrar en el portal, reset_level solo tiene que montar sprites con
+        todo ya decodificado.
+
+        Un nivel ya compilado solo necesita la música: play_music se queda
+        los bytes al reproducirla, así que hay que volver a leerla cada vez.
+        """
+        if level_id in self.pending:
+            return
+        if level_id in self.compiled and not assets:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self.pending[level_id] = self._executor.submit(self._prefetch, level_id, assets)
+
+    def _prefetch(self, level_id, assets):
+        # Devuelve el nivel compilado solo cuando todo está precargado; get()
+        # lo recoge del Future. None = falló, get() lo cargará él mismo.
+        compiled = self.compiled.get(level_id)
+        warm = compiled is None # Si ya estaba compilado, las cachés ya están llenas
+        if warm:
+            try:
+                compiled = self.load_compiled(level_id)
+            except (OSError, ValueError) as e:
+                print(f"No se pudo precargar el nivel {level_id}: {e}")
+                return None
+
+        try:
+            if warm:
+                for kind, _, kwargs in compiled["entities"]:
+                    ENTITY_TYPES[kind][0](**kwargs)
+            if assets:
+                assets.prefetch_music(f"level_{level_id}")
+        except Exception as e:
+            # Solo era calentar cachés: el nivel compilado sigue sirviendo
+            print(f"Error precargando los assets del nivel {level_id}: {e!r}")
+        return compiled
+
+    def shutdown(self):
+        """Espera al prefetch en curso y cierra el hilo (antes de pygame.quit())"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self.pending.clear()
+
+    def load_compiled(self, level_id):
+        path = self.level_path(level_id)
+        with open(path, "rb") as f:
+            source = f.read()
+
+        digest = hashlib.sha1(source + bytes([LEVEL_FORMAT])).hexdigest()[:16]
+        stem = f"level{level_id}"
+        cache_path = os.path.join(self.cache_dir, f"{stem}.{digest}.pickle")
+
+        try:
+            with open(cache_path, "rb") as f:
+                compiled = pickle.load(f)
+            self.cache_loads += 1
+            return compiled
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+        compiled = compile_level(json.loads(source), stem)
+        self.compiles += 1
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Las compilaciones de versiones anteriores del archivo sobran
+            for old in os.listdir(self.cache_dir):
+                if old.startswith(stem + ".") and old.endswith(".pickle"):
+                    os.remove(os.path.join(self.cache_dir, old))
+            with open(cache_path, "wb") as f:
+                pickle.dump(compiled, f, pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            # Sin permisos de escritura el nivel funciona igual, solo sin caché
+            print(f"No se pudo guardar la caché del nivel {level_id}: {e}")
+        return compiled
+
+    def load_level(self, level_id, all_sprites, platforms, crystals, levers, gates):
+        """Construye el nivel en los grupos dados.
+
+        Devuelve lo mismo que devolvían los antiguos load_level_N:
+        (player, portal, res_plat, level_data).
+        """
+        compiled = self.get(level_id)
+        groups = (platforms, crystals, levers, gates)
+        all_sprites.empty()
+        for group in groups:
+            group.empty()
+
+        sprites = []
+        hazards = []
+        barriers = {}
+        player = portal = res_plat = None
+
+        for kind, ident, kwargs in compiled["entities"]:
+            sprite = ENTITY_TYPES[kind][0](**kwargs)
+            sprites.append(sprite)
+            all_sprites.add(sprite)
+
+            group = ENTITY_GROUPS.get(kind)
+            if group is not None:
+                groups[group].add(sprite)
+
+            if kind == "spike":
+                hazards.append(sprite)
+            elif kind == "barrier":
+                barriers[ident] = sprite
+            elif kind == "player":
+                player = sprite
+            elif kind == "portal":
+                portal = sprite
+            elif kind == "platform" and sprite.is_resonance and res_plat is None:
+                res_plat = sprite
+
+        moving_gate = compiled["moving_gate"]
+        moving_crystal = compiled["moving_crystal"]
+        return player, portal, res_plat, {
+            "tutorial_step": compiled["tutorial_step"],
+            "popup_text": compiled["popup_text"],
+            "show_popup": compiled["show_popup"],
+            "hazards": merge_hazards(hazards),
+            "barriers": barriers,
+            "rules": [(kind, sprites[i], resolve(when, sprites)) for kind, i, when in compiled["rules"]],
+            "moving_gate": sprites[moving_gate] if moving_gate is not None else None,
+            "moving_crystal": sprites[moving_crystal] if moving_crystal is not None else None,
+        }
@@ -1,16 +1,15 @@
 import pygame
 import math # Necesario para la animación
 from .settings import *
+from .assets import AssetManager
 
 class Lever(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
         self.activated = False
         try:
-            self.image_off = pygame.image.load('assets/images/palanca.png').convert_alpha()
-            self.image_on = pygame.image.load('assets/images/palanca_activada.png').convert_alpha()
-            self.image_off = pygame.transform.scale(self.image_off, (40, 40))
-            self.image_on = pygame.transform.scale(self.image_on, (40, 40))
+            self.image_off = AssetManager.load_image('assets/images/palanca.png', (40, 40))
+            self.image_on = AssetManager.load_image('assets/images/palanca_activada.png', (40, 40))
         except FileNotFoundError:
             self.image_off = pygame.Surface((30, 40))
             self.image_off.fill((200, 50, 50)) 
@@ -18,27 +17,55 @@ class Lever(pygame.sprite.Sprite):
             self.image_on.fill((50, 200, 50)) 
         self.image = self.image_off
         self.rect = self.image.get_rect(bottomleft=(x, y))
+        self.rules = None # RuleEngine al que avisar cuando cambia 'activated'
 
-    def update(self, active_entities):
-        collision = False
-        for entity in active_entities:
-            if self.rect.colliderect(entity.rect):
-                collision = True
-                break
-        self.activated = collision
-        self.image = self.image_on if self.activated else self.image_off
-
-class Gate(pygame.sprite.Sprite):
-    def __init__(self, x, y, width=100, height=20, move_y=150, color=(100, 100, 120), loop=False):
+    def set_activated(self, activated):
+        # Lo llama el SensorIndex solo cuando alguien entra o sale del todo
+        if activated == self.activated:
+            return
+        self.activated = activated
+        self.image = self.image_on if activated else self.image_off
+        if self.rules is not None:
+            self.rules.lever_changed(self)
+
+    def snapshot(self):
+        return self.activated
+
+    def restore(self, state):
+        self.activated = state
+        self.image = self.image_on if state else self.image_off
+
+class Kinematic:
+    """Sólido que se mueve por sí solo y lleva encima a quien se posa en él.
+
+    Las entidades se enganchan al aterrizar (Player.set_ground desde
+    check_collisions) y se sueltan al saltar o salir de encima; al moverse,
+    el sólido desplaza a sus pasajeros lo mismo que se desplazó él. Así no
+    hay que buscar cada tick quién está encima entre todas las entidades.
+    """
+    def init_riders(self):
+        self.riders = []
+
+    def carry(self, dy):
+        for rider in self.riders:
+            rider.rect.y += dy
+            if dy > 0: rider.on_ground = True
+
+class Gate(Kinematic, pygame.sprite.Sprite):
+    def __init__(self, x, y, width=100, height=20, move_y=150, color=(100, 100, 120), loop=False, fill=None):
         super().__init__()
         
         try:
-            plat_img = pygame.image.load('assets/images/platform.png').convert_alpha()
-            self.image = pygame.transform.scale(plat_img, (width, height))
+            self.image = AssetManager.load_image('assets/images/platform.png', (width, height))
         except FileNotFoundError:
             self.image = pygame.Surface((width, height))
             self.image.fill(color) 
             pygame.draw.rect(self.image, (255, 255, 255), (0,0,width,height), 2) 
+
+        if fill:
+            # Color sólido (p.ej. el ascensor naranja); la imagen en caché es compartida
+            self.image = self.image.copy()
+            self.image.fill(fill)
         
         self.rect = self.image.get_rect(topleft=(x, y))
         self.initial_y = y
@@ -49,6 +76,9 @@ class Gate(pygame.sprite.Sprite):
         
         self.loop = loop
         self.moving_to_target = True 
+        self.should_open = False # Lo decide el RuleEngine del nivel
+        self.collider_set = None # SpatialHash al que avisar cuando se mueve
+        self.init_riders()
 
     def update_position(self, should_open):
         dy = 0
@@ -73,14 +103,25 @@ class Gate(pygame.sprite.Sprite):
                 dy = -self.speed
                 if self.rect.y + dy < target: dy = target - self.rect.y
                 self.rect.y += dy
+        if dy != 0:
+            self.carry(dy)
+            if self.collider_set is not None:
+                self.collider_set.move(self)
         return dy
 
+    def snapshot(self):
+        return self.rect.topleft, self.moving_to_target
+
+    def restore(self, state):
+        self.rect.topleft, self.moving_to_target = state
+        if self.collider_set is not None:
+            self.collider_set.move(self)
+
 class Spike(pygame.sprite.Sprite):
     def __init__(self, x, y, width=40):
         super().__init__()
         try:
-            spike_img = pygame.image.load('assets/images/pinchos.png').convert_alpha()
-            spike_tile = pygame.transform.scale(spike_img, (30, 30))
+            spike_tile = AssetManager.load_image('assets/images/pinchos.png', (30, 30))
             
             self.image = pygame.Surface((width, 30), pygame.SRCALPHA)
             for i in range(0, width, 30):
@@ -91,47 +132,73 @@ class Spike(pygame.sprite.Sprite):
             pygame.draw.polygon(self.image, (255, 0, 0), [(0, 30), (width//2, 0), (width, 30)])
         
         self.rect = self.image.get_rect(bottomleft=(x, y))
+        self.static = True # Nunca cambia: va horneado en la capa estática
 
 class Barrier(pygame.sprite.Sprite):
+    # La pulsación solo cambia el alpha: la imagen teñida se calcula una vez
+    # por (color, ancho, alto) y cada barrera se queda una copia propia a la
+    # que le cambia el alpha con set_alpha (no crea superficies nuevas).
+    PULSE_STEPS = 32
+    PULSE_SPEED = 0.005 # rad/ms de la onda senoidal
+    # Una vuelta de la onda: alpha oscila entre 100 y 200
+    PULSE_ALPHAS = [150 + int(50 * math.sin(2 * math.pi * i / n)) for n in (PULSE_STEPS,) for i in range(n)]
+    _tint_cache = {}
+
     def __init__(self, x, y, width, height, color):
         super().__init__()
         self.original_image = None # Guardamos la original para la animación
         self.color = color
         
         try:
-            barrier_img = pygame.image.load('assets/images/barrera.png').convert_alpha()
-            self.original_image = pygame.transform.scale(barrier_img, (width, height))
-            
-            # Aplicar color inicial
-            tinted = self.original_image.copy()
-            tinted.fill(self.color, special_flags=pygame.BLEND_MULT)
-            self.image = tinted
-            
+            self.original_image = AssetManager.load_image('assets/images/barrera.png', (width, height))
         except FileNotFoundError:
-            self.image = pygame.Surface((width, height))
-            self.image.fill(color)
-            self.original_image = self.image.copy()
+            self.original_image = pygame.Surface((width, height))
+            self.original_image.fill(color)
             
+        # Copia propia: set_alpha no debe afectar a las demás barreras
+        self.image = self.build_tinted(self.original_image, color).copy()
+        self.pulse_step = None
         self.rect = self.image.get_rect(topleft=(x, y))
         self.active = True
         self.original_pos = (x, y)
+        self.collider_set = None # SpatialHash al que avisar si se abre/cierra
+
+    @classmethod
+    def build_tinted(cls, original_image, color):
+        key = (color, original_image.get_width(), original_image.get_height())
+        tinted = cls._tint_cache.get(key)
+        if tinted is None:
+            # El teñido (BLEND_MULT) se hace una sola vez
+            tinted = original_image.copy()
+            tinted.fill(color, special_flags=pygame.BLEND_MULT)
+            cls._tint_cache[key] = tinted
+        return tinted
 
     def update(self):
         # --- EFECTO DE PULSACIÓN (Animación) ---
-        if self.active and self.original_image:
-            # Usamos el tiempo para crear una onda senoidal
-            # Esto hace que el valor alpha oscile entre 100 y 200
-            time = pygame.time.get_ticks()
-            alpha = 150 + int(50 * math.sin(time * 0.005)) 
-            
-            # Recreamos la imagen base para que no se degrade
-            self.image = self.original_image.copy()
-            self.image.fill(self.color, special_flags=pygame.BLEND_MULT)
-            self.image.set_alpha(alpha)
+        if self.active:
+            # Posición en la onda senoidal según el tiempo -> alpha precalculado
+            phase = pygame.time.get_ticks() * self.PULSE_SPEED / (2 * math.pi)
+            step = int(phase * self.PULSE_STEPS) % self.PULSE_STEPS
+            if step != self.pulse_step:
+                self.pulse_step = step
+                self.image.set_alpha(self.PULSE_ALPHAS[step])
 
     def update_state(self, is_active):
+        if is_active == self.active:
+            return
         self.active = is_active
         if self.active:
             self.rect.topleft = self.original_pos
         else:
-            self.rect.x = -2000
\ No newline at end of file
+            self.rect.x = -2000
+
+        if self.collider_set is not None:
+            if self.active: self.collider_set.insert(self)
+            else: self.collider_set.remove(self)
+
+    def snapshot(self):
+        return self.active
+
+    def restore(self, state):
+        self.update_state(state)
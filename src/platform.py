@@ -1,24 +1,23 @@
 import pygame
 from src.settings import *
+from src.assets import AssetManager
 
 class Platform(pygame.sprite.Sprite):
-    def __init__(self, x, y, type="normal", width=None, is_resonance=False):
+    def __init__(self, x, y, type="normal", width=None, is_resonance=False, resonance_chain=2):
         super().__init__()
         self.is_resonance = is_resonance
+        # Tamaño mínimo de la cadena de resonancia que la hace sólida
+        self.resonance_chain = resonance_chain
         self.type = type
         
         self.images = {}
         try:
             # Cargamos imágenes
-            floor_img = pygame.image.load('assets/images/piso.png').convert_alpha()
-            medium_img = pygame.image.load('assets/images/platform.png').convert_alpha()
-            small_img = pygame.image.load('assets/images/plataforma_chica.png').convert_alpha()
-            
-            self.images['piso'] = floor_img
+            self.images['piso'] = AssetManager.load_image('assets/images/piso.png')
             # Normal: 200x40
-            self.images['normal'] = pygame.transform.scale(medium_img, (200, 40))
+            self.images['normal'] = AssetManager.load_image('assets/images/platform.png', (200, 40))
             # Chica: 100x40
-            self.images['chica'] = pygame.transform.scale(small_img, (100, 40))
+            self.images['chica'] = AssetManager.load_image('assets/images/plataforma_chica.png', (100, 40))
             
         except FileNotFoundError:
             self.images = None
@@ -33,7 +32,7 @@ class Platform(pygame.sprite.Sprite):
             if type == "piso":
                 target_w = width if width else SCREEN_WIDTH
                 # El piso tiene 60px de alto según tu imagen
-                self.image = pygame.transform.scale(self.images['piso'], (target_w, 60))
+                self.image = AssetManager.load_image('assets/images/piso.png', (target_w, 60))
             elif type == "normal":
                 self.image = self.images['normal']
             elif type == "chica":
@@ -54,8 +53,20 @@ class Platform(pygame.sprite.Sprite):
         # Esto soluciona que el personaje se hunda o flote.
         
         self.active = not is_resonance 
+        # Las fijas van horneadas en la capa estática del renderer
+        self.static = not is_resonance
+        self.collider_set = None # SpatialHash al que avisar si cambia 'active'
 
     def update_resonance(self, active):
-        if self.is_resonance:
+        if self.is_resonance and active != self.active:
             self.active = active
-            self.image.set_alpha(255 if active else 50)
\ No newline at end of file
+            self.image.set_alpha(255 if active else 50)
+            if self.collider_set is not None:
+                if active: self.collider_set.insert(self)
+                else: self.collider_set.remove(self)
+
+    def snapshot(self):
+        return self.active
+
+    def restore(self, state):
+        self.update_resonance(state)
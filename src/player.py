@@ -1,99 +1,359 @@
 import pygame
+from array import array
 from .settings import *
+from .assets import AssetManager
+from .mechanics import Kinematic
+
+# Bits de la columna 'flags' de Recording
+FLAG_FACING_RIGHT = 1
+FLAG_ON_GROUND = 2
+
+class Recording:
+    """Grabación de una toma en columnas (una entrada por tick).
+
+    En lugar de un dict por frame se guardan arrays compactos: x/y como
+    enteros de 16 bits, velocity_x como 8 bits y facing_right/on_ground
+    empaquetados en un byte. Al crear un eco la grabación se le entrega tal
+    cual (sin copiar) y el jugador empieza una nueva.
+
+    La toma está acotada a max_ticks; al llenarse se aplica la política
+    'overflow' (ver RECORDING_OVERFLOW en settings).
+    """
+    __slots__ = ('xs', 'ys', 'vxs', 'flags', 'max_ticks', 'overflow', 'head', 'dropped')
+    mode = "positions" # Ver ECHO_MODE en settings
+
+    def __init__(self, max_ticks=None, overflow=None):
+        self.xs = array('h')
+        self.ys = array('h')
+        self.vxs = array('b')
+        self.flags = array('B')
+
+        self.max_ticks = max_ticks or int(RECORDING_MAX_SECONDS * SIM_HZ)
+        self.overflow = overflow or RECORDING_OVERFLOW
+        if self.overflow not in ("stop", "keep_last", "truncate"):
+            raise ValueError(f"Política de grabación desconocida: {self.overflow}")
+        self.head = 0     # Inicio lógico de la toma cuando el buffer circular da la vuelta
+        self.dropped = 0  # Ticks descartados o no grabados por el límite
+
+    def __len__(self):
+        return len(self.xs)
+
+    def clear(self):
+        """Vacía la toma para reutilizar el objeto en otra"""
+        for col in (self.xs, self.ys, self.vxs, self.flags):
+            del col[:]
+        self.head = 0
+        self.dropped = 0
+
+    def append(self, x, y, facing_right, velocity_x, on_ground):
+        flags = (FLAG_FACING_RIGHT if facing_right else 0) | (FLAG_ON_GROUND if on_ground else 0)
+
+        if len(self.xs) >= self.max_ticks:
+            self.dropped += 1
+            if self.overflow == "stop":
+                return
+            if self.overflow == "keep_last":
+                # Sobrescribimos el tick más antiguo
+                i = self.head
+                self.xs[i] = x
+                self.ys[i] = y
+                self.vxs[i] = int(velocity_x)
+                self.flags[i] = flags
+                self.head = (i + 1) % self.max_ticks
+                return
+            # "truncate": tiramos la mitad más antigua de una vez
+            half = self.max_ticks // 2
+            for col in (self.xs, self.ys, self.vxs, self.flags):
+                del col[:half]
+            self.dropped += half - 1
+
+        self.xs.append(x)
+        self.ys.append(y)
+        self.vxs.append(int(velocity_x))
+        self.flags.append(flags)
+
+    def linearize(self):
+        """Deja la toma en orden (índice 0 = tick más antiguo) para reproducirla"""
+        if self.head:
+            h = self.head
+            for col in (self.xs, self.ys, self.vxs, self.flags):
+                col[:] = col[h:] + col[:h]
+            self.head = 0
+        return self
+
+    def frame(self, index):
+        """Devuelve (x, y, facing_right, velocity_x, on_ground) del tick indicado"""
+        if self.head:
+            index = (self.head + index) % len(self.xs)
+        flags = self.flags[index]
+        return (self.xs[index], self.ys[index], bool(flags & FLAG_FACING_RIGHT),
+                self.vxs[index], bool(flags & FLAG_ON_GROUND))
+
+    def start_pos(self):
+        return self.frame(0)[:2] if len(self.xs) else None
+
+    @property
+    def nbytes(self):
+        """Memoria ocupada por los datos grabados, en bytes"""
+        return sum(col.itemsize * len(col) for col in (self.xs, self.ys, self.vxs, self.flags))
+
+    @property
+    def max_nbytes(self):
+        """Techo de memoria de la toma con el límite actual"""
+        return self.max_ticks * sum(col.itemsize for col in (self.xs, self.ys, self.vxs, self.flags))
+
+class InputRecording:
+    """Toma que solo guarda la entrada de cada tick (ECHO_MODE = "inputs").
+
+    Un byte por tick con la máscara INPUT_*; el eco la vuelve a pasar por
+    la misma física que el jugador. Cada KEYFRAME_TICKS ticks se guarda
+    además el estado del jugador antes de aplicar la entrada (posición,
+    velocidad vertical, suelo y orientación): el primero es el punto de
+    partida del eco y los demás permiten descartar por bloques la parte más
+    antigua cuando la toma se llena (sin ellos no se sabría desde dónde
+    seguir simulando).
+    """
+    __slots__ = ('inputs', 'kxs', 'kys', 'kvys', 'kflags', 'max_ticks', 'overflow', 'dropped')
+    mode = "inputs"
+    KEYFRAME_TICKS = SIM_HZ
+
+    def __init__(self, max_ticks=None, overflow=None):
+        self.inputs = array('B')
+        self.kxs = array('h')
+        self.kys = array('h')
+        self.kvys = array('d') # Exacta: el eco tiene que repetir la física al bit
+        self.kflags = array('B')
+
+        self.max_ticks = max_ticks or int(RECORDING_MAX_SECONDS * SIM_HZ)
+        self.overflow = overflow or RECORDING_OVERFLOW
+        if self.overflow not in ("stop", "keep_last", "truncate"):
+            raise ValueError(f"Política de grabación desconocida: {self.overflow}")
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def columns(self):
+        return (self.inputs, self.kxs, self.kys, self.kvys, self.kflags)
+
+    def clear(self):
+        for col in self.columns():
+            del col[:]
+        self.dropped = 0
+
+    def append(self, input_bits, player):
+        """Graba la entrada del tick; llamar antes de aplicarla"""
+        n = len(self.inputs)
+        if n >= self.max_ticks:
+            if self.overflow == "stop":
+                self.dropped += 1
+                return
+            # Se descarta desde el principio hasta un keyframe: un bloque
+            # ("keep_last") o la mitad de la toma ("truncate")
+            k = self.KEYFRAME_TICKS
+            blocks = 1 if self.overflow == "keep_last" else max(1, self.max_ticks // 2 // k)
+            del self.inputs[:blocks * k]
+            for col in (self.kxs, self.kys, self.kvys, self.kflags):
+                del col[:blocks]
+            self.dropped += blocks * k
+            n = len(self.inputs)
+
+        if n % self.KEYFRAME_TICKS == 0:
+            self.kxs.append(player.rect.x)
+            self.kys.append(player.rect.y)
+            self.kvys.append(player.velocity.y)
+            self.kflags.append((FLAG_FACING_RIGHT if player.facing_right else 0) |
+                               (FLAG_ON_GROUND if player.on_ground else 0))
+        self.inputs.append(input_bits)
+
+    def linearize(self):
+        return self # Siempre está en orden
+
+    def start_pos(self):
+        return (self.kxs[0], self.kys[0]) if len(self.inputs) else None
+
+    def start(self, player):
+        """Deja al eco en el estado en que empezó la toma"""
+        player.rect.topleft = (self.kxs[0], self.kys[0])
+        player.velocity.update(0, self.kvys[0])
+        flags = self.kflags[0]
+        player.facing_right = flags & FLAG_FACING_RIGHT != 0
+        player.on_ground = flags & FLAG_ON_GROUND != 0
+
+    @property
+    def nbytes(self):
+        return sum(col.itemsize * len(col) for col in self.columns())
+
+    @property
+    def max_nbytes(self):
+        keyframe = sum(col.itemsize for col in self.columns()[1:])
+        return self.max_ticks * self.inputs.itemsize + -(-self.max_ticks // self.KEYFRAME_TICKS) * keyframe
 
 class Player(pygame.sprite.Sprite):
+    SIZE = (50, 80)
+    # --- ATLAS DE ANIMACIÓN COMPARTIDO ---
+    # is_echo -> {facing_right -> {'idle', 'jump', 'run': [...]}}
+    # Escalado, teñido (ecos) y volteado (mirando a la izquierda) se hacen una
+    # sola vez por proceso; crear un eco o animar no transforma superficies.
+    _atlas = {}
+
     def __init__(self, x, y, is_echo=False):
         super().__init__()
         
-        self.animations = {}
-        self.size = (50, 80) 
-
-        try:
-            idle_img = pygame.image.load('assets/images/player_idle.png').convert_alpha()
-            jump_img = pygame.image.load('assets/images/player_jump.png').convert_alpha()
-            
-            run_raw1 = pygame.image.load('assets/images/player_run.png').convert_alpha()
-            run_raw3 = pygame.image.load('assets/images/player_run3.png').convert_alpha()
-            
-            idle_scaled = pygame.transform.scale(idle_img, self.size)
-            self.animations['idle'] = idle_scaled
-            self.animations['jump'] = pygame.transform.scale(jump_img, self.size)
-            
-            run_scaled1 = pygame.transform.scale(run_raw1, self.size)
-            run_scaled3 = pygame.transform.scale(run_raw3, self.size)
-
-            self.animations['run'] = [
-                run_scaled1,
-                idle_scaled,
-                run_scaled3,
-                idle_scaled
-            ]
-            
-        except FileNotFoundError:
-            surf = pygame.Surface(self.size)
-            surf.fill(COLOR_PLAYER)
-            self.animations['idle'] = surf
-            self.animations['jump'] = surf
-            self.animations['run'] = [surf]
+        self.size = self.SIZE
+        self.atlas = self.get_atlas(is_echo)
+        self.animations = self.atlas[True]
 
         self.image = self.animations['idle']
         self.rect = self.image.get_rect(topleft=(x, y))
         
         self.velocity = pygame.math.Vector2(0, 0)
         self.on_ground = False
+        self.ground = None # Plataforma sobre la que está de pie (ver set_ground)
         self.facing_right = True
         self.is_echo = is_echo
         
-        self.recording = [] 
+        self.recording = Recording()
         self.playback_index = 0
         self.finished_playback = False
 
+        self.anim_tick = 0 # Ticks de simulación, no milisegundos de reloj
         self.walk_timer = 0
         self.walk_frame = 0 
 
-        if self.is_echo:
-            self.tint_images()
+    def reset_state(self, x, y):
+        """Deja el sprite como recién creado en (x, y) (para reciclar ecos)"""
+        self.animations = self.atlas[True]
+        self.image = self.animations['idle']
+        self.rect.topleft = (x, y)
+        self.velocity.update(0, 0)
+        self.on_ground = False
+        self.set_ground(None)
+        self.facing_right = True
+        self.playback_index = 0
+        self.finished_playback = False
+        self.anim_tick = 0
+        self.walk_timer = 0
+        self.walk_frame = 0
+
+    def set_ground(self, platform):
+        """Engancha la entidad a la plataforma que pisa (o la suelta con None).
+
+        Si es cinemática (Gate) pasa a ser uno de sus pasajeros y se moverá
+        con ella.
+        """
+        old = self.ground
+        if platform is old:
+            return
+        if isinstance(old, Kinematic):
+            old.riders.remove(self)
+        self.ground = platform
+        if isinstance(platform, Kinematic):
+            platform.riders.append(self)
+
+    def find_ground(self, colliders):
+        """Busca justo debajo la plataforma que pisa (ecos que dejan de reproducirse)"""
+        bottom = self.rect.bottom
+        for platform in colliders.query(self.rect.move(0, 1)):
+            if platform.rect.top == bottom:
+                self.set_ground(platform)
+                return
+        self.set_ground(None)
 
-    def tint_images(self):
-        for key, value in self.animations.items():
-            if isinstance(value, list):
-                tinted_list = []
-                for img in value:
-                    tinted_list.append(self.apply_tint(img))
-                self.animations[key] = tinted_list
-            else:
-                self.animations[key] = self.apply_tint(value)
+    def snapshot(self):
+        return self.rect.topleft
 
-    def apply_tint(self, surface):
+    def restore(self, state):
+        # Reaparece donde empezó el nivel, con una toma vacía
+        self.reset_state(*state)
+        self.recording.clear()
+
+    @classmethod
+    def load_animations(cls):
+        animations = {}
+        try:
+            idle_scaled = AssetManager.load_image('assets/images/player_idle.png', cls.SIZE)
+            animations['idle'] = idle_scaled
+            animations['jump'] = AssetManager.load_image('assets/images/player_jump.png', cls.SIZE)
+            
+            run_scaled1 = AssetManager.load_image('assets/images/player_run.png', cls.SIZE)
+            run_scaled3 = AssetManager.load_image('assets/images/player_run3.png', cls.SIZE)
+
+            animations['run'] = [
+                run_scaled1,
+                idle_scaled,
+                run_scaled3,
+                idle_scaled
+            ]
+            
+        except FileNotFoundError:
+            surf = pygame.Surface(cls.SIZE)
+            surf.fill(COLOR_PLAYER)
+            animations['idle'] = surf
+            animations['jump'] = surf
+            animations['run'] = [surf]
+        return animations
+
+    @classmethod
+    def get_atlas(cls, is_echo):
+        atlas = cls._atlas.get(is_echo)
+        if atlas is not None:
+            return atlas
+
+        base = cls.load_animations()
+        # Caché local para que los frames repetidos (idle en 'run') se
+        # procesen una sola vez y sigan siendo la misma superficie
+        done = {}
+
+        def variant(surface, facing_right):
+            key = (surface, facing_right)
+            if key not in done:
+                img = surface if facing_right else pygame.transform.flip(surface, True, False)
+                done[key] = cls.apply_tint(img) if is_echo else img
+            return done[key]
+
+        atlas = {}
+        for facing_right in (True, False):
+            atlas[facing_right] = {
+                'idle': variant(base['idle'], facing_right),
+                'jump': variant(base['jump'], facing_right),
+                'run': [variant(img, facing_right) for img in base['run']],
+            }
+        cls._atlas[is_echo] = atlas
+        return atlas
+
+    @staticmethod
+    def apply_tint(surface):
         mask = pygame.mask.from_surface(surface)
         echo_surf = mask.to_surface(setcolor=COLOR_ECHO, unsetcolor=(0,0,0,0))
         echo_surf.set_alpha(150)
         return echo_surf
 
-    def handle_input(self):
-        keys = pygame.key.get_pressed()
+    def handle_input(self, input_bits):
         self.velocity.x = 0
 
-        if keys[pygame.K_a]:
+        if input_bits & INPUT_LEFT:
             self.velocity.x = -SPEED
             self.facing_right = False
         
-        if keys[pygame.K_d]:
+        if input_bits & INPUT_RIGHT:
             self.velocity.x = SPEED
             self.facing_right = True
             
-        if keys[pygame.K_w] and self.on_ground:
+        if input_bits & INPUT_JUMP and self.on_ground:
             self.velocity.y = JUMP_FORCE
             self.on_ground = False
 
     def animate(self):
-        current_time = pygame.time.get_ticks()
+        self.anim_tick += 1
+        current_time = self.anim_tick
+        self.animations = self.atlas[self.facing_right]
         img = self.animations['idle']
 
         if not self.on_ground:
             img = self.animations['jump']
         elif self.velocity.x != 0:
-            animation_speed = 120 
+            animation_speed = 0.12 * SIM_HZ # 120 ms expresados en ticks
             
             if current_time - self.walk_timer > animation_speed:
                 num_frames = len(self.animations['run'])
@@ -106,53 +366,41 @@ class Player(pygame.sprite.Sprite):
             if self.walk_frame != 0:
                  self.walk_frame = 0
 
-        if not self.facing_right:
-            img = pygame.transform.flip(img, True, False)
         self.image = img
 
-    # --- CAMBIO AQUÍ: input_active ---
-    def update(self, platforms, input_active=True):
-        if not self.is_echo:
-            # Si el input está activo, leemos teclas. Si no, frenamos al personaje.
-            if input_active:
-                self.handle_input()
-            else:
-                self.velocity.x = 0
-            
-            self.velocity.y += GRAVITY
-            
-            self.rect.x += self.velocity.x
-            self.check_collisions(platforms, 'horizontal')
-            
-            self.rect.y += self.velocity.y
-            self.check_collisions(platforms, 'vertical')
-            
-            self.animate()
-            
-            frame_data = {
-                'x': self.rect.x, 
-                'y': self.rect.y,
-                'facing_right': self.facing_right,
-                'velocity_x': self.velocity.x,
-                'on_ground': self.on_ground
-            }
-            self.recording.append(frame_data)
-            
+    # --- input_bits: máscara INPUT_LEFT / INPUT_RIGHT / INPUT_JUMP del tick ---
+    # Con 0 (p. ej. durante un popup) el personaje simplemente se frena.
+    # Los ecos no pasan por aquí: los reproduce EchoSystem (src/echo.py),
+    # que en modo "inputs" los mueve con move() igual que al jugador.
+    def update(self, colliders, input_bits=0):
+        recording = self.recording
+        if recording.mode == "inputs":
+            # La entrada (y el estado de partida) se graban antes de aplicarla
+            recording.append(input_bits, self)
+            self.move(colliders, input_bits)
         else:
-            if self.playback_index < len(self.recording):
-                data = self.recording[self.playback_index]
-                self.rect.x = data['x']
-                self.rect.y = data['y']
-                self.facing_right = data['facing_right']
-                self.velocity.x = data.get('velocity_x', 0)
-                self.on_ground = data.get('on_ground', True)
-                self.animate()
-                self.playback_index += 1
-            else:
-                self.finished_playback = True
-
-    def check_collisions(self, platforms, direction):
-        hits = pygame.sprite.spritecollide(self, platforms, False)
+            self.move(colliders, input_bits)
+            recording.append(self.rect.x, self.rect.y, self.facing_right,
+                              self.velocity.x, self.on_ground)
+
+    def move(self, colliders, input_bits):
+        """Un tick de física: entrada, gravedad, colisiones y animación"""
+        self.handle_input(input_bits)
+        
+        self.velocity.y += GRAVITY
+        
+        self.rect.x += self.velocity.x
+        self.check_collisions(colliders, 'horizontal')
+        
+        self.rect.y += self.velocity.y
+        self.check_collisions(colliders, 'vertical')
+        
+        self.animate()
+
+    def check_collisions(self, colliders, direction):
+        # colliders: SpatialHash con los sólidos activos (src/collision.py)
+        hits = colliders.query(self.rect)
+        ground = None
         for platform in hits:
             if direction == 'horizontal':
                 if self.velocity.x > 0: self.rect.right = platform.rect.left
@@ -162,6 +410,11 @@ class Player(pygame.sprite.Sprite):
                     self.rect.bottom = platform.rect.top
                     self.velocity.y = 0
                     self.on_ground = True
+                    ground = platform
                 if self.velocity.y < 0:
                     self.rect.top = platform.rect.bottom
-                    self.velocity.y = 0
\ No newline at end of file
+                    self.velocity.y = 0
+        if direction == 'vertical':
+            # La gravedad nos hunde un poco en el suelo cada tick: si este
+            # tick no aterrizamos en nada es que saltamos o nos salimos
+            self.set_ground(ground)
\ No newline at end of file
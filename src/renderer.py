@@ -0,0 +1,125 @@
+import pygame
+from src.settings import *
+
+class LevelRenderer:
+    """Dibuja el nivel en juego actualizando solo lo que cambia.
+
+    Al cargar un nivel se precompone en una sola superficie el fondo más
+    toda la geometría estática (sprites con static = True: suelo,
+    plataformas fijas y pinchos). En cada frame solo se restauran desde esa
+    capa y se redibujan las zonas que cambiaron: sprites que se movieron o
+    cambiaron de imagen, líneas de resonancia y HUD/popup. draw() devuelve
+    esos rects para pygame.display.update(), o None si hubo que redibujar
+    la pantalla entera (y entonces toca flip()).
+    """
+    def __init__(self, screen, backgrounds):
+        self.screen = screen
+        self.backgrounds = backgrounds
+        self.static_layer = None
+        self.level_serial = None
+        self.full_redraw = True
+
+        self.drawn = {}          # sprite -> (rect, imagen, alpha) del último frame
+        self.line_rects = []     # Zonas de las líneas de resonancia del último frame
+        self.overlay_rects = []  # HUD y popup del último frame
+
+    def invalidate(self):
+        """Fuerza un redibujado completo en el próximo frame (cambio de pantalla)"""
+        self.full_redraw = True
+
+    def bake(self, world):
+        background = self.backgrounds.get(world.current_level)
+        if background:
+            layer = background.copy()
+        else:
+            layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+            layer.fill(COLOR_BG)
+
+        for sprite in world.all_sprites:
+            if getattr(sprite, 'static', False):
+                layer.blit(sprite.image, sprite.rect)
+
+        self.static_layer = layer
+        self.level_serial = world.level_serial
+        self.full_redraw = True
+
+    def render_line(self, start, end):
+        rect = pygame.Rect(min(start[0], end[0]), min(start[1], end[1]),
+                           abs(start[0] - end[0]) + 1, abs(start[1] - end[1]) + 1).inflate(4, 4)
+        surf = pygame.Surface(rect.size, pygame.SRCALPHA)
+        pygame.draw.line(surf, COLOR_RESONANCE, (start[0] - rect.x, start[1] - rect.y),
+                         (end[0] - rect.x, end[1] - rect.y), 2)
+        return surf, rect
+
+    def draw(self, world, alpha, overlay=None):
+        """Dibuja un frame. overlay(screen) dibuja el HUD y devuelve sus rects."""
+        if world.level_serial != self.level_serial:
+            self.bake(world)
+
+        screen = self.screen
+        layer = self.static_layer
+        screen_rect = screen.get_rect()
+
+        # --- 1. ESTADO ACTUAL DE LOS SPRITES DINÁMICOS ---
+        current = {}
+        changed = []
+        for sprite in world.all_sprites:
+            if getattr(sprite, 'static', False):
+                continue
+            image = sprite.image
+            rect = image.get_rect(topleft=world.render_position(sprite, alpha))
+            state = (rect, image, image.get_alpha())
+            current[sprite] = state
+
+            prev = self.drawn.get(sprite)
+            if prev != state:
+                changed.append(rect)
+                if prev: changed.append(prev[0])
+
+        # Sprites que ya no están (cristales recogidos, ecos borrados...)
+        for sprite, prev in self.drawn.items():
+            if sprite not in current:
+                changed.append(prev[0])
+
+        # Las líneas se pintan en superficies pequeñas: recortar un blit es
+        # exacto, mientras que draw.line rasteriza distinto si se recorta
+        lines = [self.render_line(start, end) for start, end in world.resonance_links]
+        line_rects = [rect for _, rect in lines]
+
+        # --- 2. REDIBUJADO ---
+        if self.full_redraw:
+            screen.blit(layer, (0, 0))
+            for line_surf, rect in lines:
+                screen.blit(line_surf, rect)
+            for rect, image, _ in current.values():
+                screen.blit(image, rect)
+            dirty = None
+        else:
+            dirty = []
+            for r in changed + self.line_rects + line_rects + self.overlay_rects:
+                r = r.clip(screen_rect)
+                if r.width and r.height:
+                    dirty.append(r)
+
+            # Cada zona se restaura desde la capa estática y se redibuja lo que
+            # la toca, recortado a la zona para no acumular transparencias
+            for r in dirty:
+                screen.set_clip(r)
+                screen.blit(layer, r, r)
+                for line_surf, rect in lines:
+                    if rect.colliderect(r):
+                        screen.blit(line_surf, rect)
+                for rect, image, _ in current.values():
+                    if rect.colliderect(r):
+                        screen.blit(image, rect)
+            screen.set_clip(None)
+
+        overlay_rects = overlay(screen) if overlay else []
+        if dirty is not None:
+            dirty.extend(overlay_rects)
+
+        self.drawn = current
+        self.line_rects = line_rects
+        self.overlay_rects = overlay_rects
+        self.full_redraw = False
+        return dirty
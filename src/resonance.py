@@ -0,0 +1,69 @@
+from src.settings import *
+
+def detect_resonance(entities, max_dist=RESONANCE_DIST):
+    """Detecta qué entidades resuenan entre sí (centros a menos de max_dist).
+
+    Las entidades se reparten en celdas de max_dist de lado, así que cada
+    una solo se compara con las de su celda y las 8 vecinas. Devuelve:
+      - links: pares (i, j) de índices en 'entities' que resuenan
+      - chains: componentes conexas del grafo de resonancia con 2 o más
+        entidades (listas de índices), de mayor a menor
+    """
+    n = len(entities)
+    if n < 2:
+        return [], []
+
+    max_dist_sq = max_dist * max_dist
+    centers = [e.rect.center for e in entities]
+
+    # 1. Reparto en celdas
+    cells = {}
+    for i, (x, y) in enumerate(centers):
+        key = (x // max_dist, y // max_dist)
+        bucket = cells.get(key)
+        if bucket is None:
+            cells[key] = [i]
+        else:
+            bucket.append(i)
+
+    # 2. Union-find sobre los índices
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    links = []
+    for (cx, cy), bucket in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                other = cells.get((cx + dx, cy + dy))
+                if other is None:
+                    continue
+                for i in bucket:
+                    xi, yi = centers[i]
+                    for j in other:
+                        # Cada par se evalúa una sola vez
+                        if j <= i:
+                            continue
+                        xj, yj = centers[j]
+                        ddx = xi - xj
+                        ddy = yi - yj
+                        if ddx * ddx + ddy * ddy < max_dist_sq:
+                            links.append((i, j))
+                            ri, rj = find(i), find(j)
+                            if ri != rj:
+                                parent[rj] = ri
+
+    if not links:
+        return links, []
+
+    # 3. Agrupamos por raíz
+    groups = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    chains = [g for g in groups.values() if len(g) > 1]
+    chains.sort(key=len, reverse=True)
+    return links, chains
@@ -0,0 +1,137 @@
+from src.settings import *
+
+# --- REGLAS DE LOS NIVELES ---
+# Cada nivel declara en su JSON una lista de reglas:
+#   {"open": <id de barrera o gate, o "portal">, "when": <condición>}
+# Condiciones:
+#   true / false
+#   {"lever": "<id>"}             la palanca está activada
+#   {"crystals_cleared": true}    no quedan cristales
+#   {"and": [...]}, {"or": [...]}, {"not": <condición>}
+#
+# Compiladas son tuplas: ("const", bool), ("lever", índice), ("crystals",),
+# ("and", (...)), ("or", (...)), ("not", cond). Al construir el nivel los
+# índices de entidad se cambian por los sprites.
+
+RULE_TARGETS = ("barrier", "gate", "portal")
+
+
+def compile_condition(cond, lever_ref, name):
+    """Valida una condición del JSON. lever_ref(id) devuelve el índice de la palanca."""
+    if isinstance(cond, bool):
+        return ("const", cond)
+    if not isinstance(cond, dict) or len(cond) != 1:
+        raise ValueError(f"{name}: condición no válida {cond!r}")
+
+    (op, arg), = cond.items()
+    if op == "lever":
+        return ("lever", lever_ref(arg))
+    if op == "crystals_cleared":
+        return ("crystals",) if arg else ("not", ("crystals",))
+    if op in ("and", "or"):
+        if not isinstance(arg, list) or not arg:
+            raise ValueError(f"{name}: '{op}' necesita una lista de condiciones")
+        return (op, tuple(compile_condition(c, lever_ref, name) for c in arg))
+    if op == "not":
+        return ("not", compile_condition(arg, lever_ref, name))
+    raise ValueError(f"{name}: operador desconocido '{op}'")
+
+
+def resolve(cond, sprites):
+    """Cambia los índices de palanca por los sprites ya construidos"""
+    op = cond[0]
+    if op == "lever":
+        return ("lever", sprites[cond[1]])
+    if op in ("and", "or"):
+        return (op, tuple(resolve(c, sprites) for c in cond[1]))
+    if op == "not":
+        return ("not", resolve(cond[1], sprites))
+    return cond
+
+
+def evaluate(cond, crystals):
+    op = cond[0]
+    if op == "lever":
+        return cond[1].activated
+    if op == "and":
+        return all(evaluate(c, crystals) for c in cond[1])
+    if op == "or":
+        return any(evaluate(c, crystals) for c in cond[1])
+    if op == "not":
+        return not evaluate(cond[1], crystals)
+    if op == "crystals":
+        return len(crystals) == 0
+    return cond[1]
+
+
+def dependencies(cond, levers=None):
+    """Palancas de las que depende la condición y si depende de los cristales"""
+    if levers is None:
+        levers = []
+    op = cond[0]
+    uses_crystals = op == "crystals"
+    if op == "lever":
+        if cond[1] not in levers: levers.append(cond[1])
+    elif op in ("and", "or"):
+        for c in cond[1]:
+            uses_crystals |= dependencies(c, levers)[1]
+    elif op == "not":
+        uses_crystals = dependencies(cond[1], levers)[1]
+    return levers, uses_crystals
+
+
+class RuleEngine:
+    """Aplica las reglas del nivel solo cuando cambia algo de lo que dependen.
+
+    Cada regla queda indexada por las palancas que lee (y por los cristales
+    si los usa). Una palanca avisa con lever_changed() solo cuando su
+    'activated' cambia, y World avisa con crystals_changed() al recoger; en
+    un tick sin cambios no se evalúa nada.
+    """
+    def __init__(self):
+        self.rules = []         # (tipo de objetivo, sprite, condición)
+        self.lever_rules = {}   # palanca -> reglas que la leen, en orden del nivel
+        self.crystal_rules = []
+        self.crystals = ()
+
+        # Estadísticas
+        self.evaluations = 0
+
+    def load(self, rules, crystals):
+        self.rules = rules
+        self.crystals = crystals
+        self.lever_rules = {}
+        self.crystal_rules = []
+        for rule in rules:
+            levers, uses_crystals = dependencies(rule[2])
+            for lever in levers:
+                self.lever_rules.setdefault(lever, []).append(rule)
+                lever.rules = self
+            if uses_crystals:
+                self.crystal_rules.append(rule)
+
+    def apply(self, rule):
+        kind, target, cond = rule
+        is_open = evaluate(cond, self.crystals)
+        self.evaluations += 1
+        if kind == "barrier":
+            target.update_state(not is_open)
+        elif kind == "gate":
+            target.should_open = is_open
+        elif is_open:
+            target.activate()
+        else:
+            target.close()
+
+    def evaluate_all(self):
+        """Estado inicial (al cargar o restaurar el nivel)"""
+        for rule in self.rules:
+            self.apply(rule)
+
+    def lever_changed(self, lever):
+        for rule in self.lever_rules.get(lever, ()):
+            self.apply(rule)
+
+    def crystals_changed(self):
+        for rule in self.crystal_rules:
+            self.apply(rule)
@@ -0,0 +1,111 @@
+from src.settings import *
+from src.collision import SpatialHash
+
+class SensorIndex:
+    """Volúmenes sensores (palancas) en un SpatialHash compartido.
+
+    En cada tick solo se consulta el índice por las entidades que se
+    movieron; lo que tiene dentro cada sensor se guarda entre ticks y de la
+    diferencia salen los eventos de entrada/salida. Un sensor solo se entera
+    (sensor.set_activated) cuando pasa de vacío a ocupado o al revés, y en
+    el orden en que se registró, igual que al recorrer el grupo de palancas.
+    Los sensores se suponen quietos.
+    """
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.index = SpatialHash(cell_size)
+        self.order = {}      # sensor -> orden de registro
+        self.occupants = {}  # sensor -> set de entidades dentro
+        self.tracked = {}    # entidad -> (posición, sensores que toca)
+        self.events = []     # (entidad, sensor, entra) del último update
+
+    def __len__(self):
+        return len(self.order)
+
+    def clear(self):
+        self.index.clear()
+        self.order.clear()
+        self.occupants.clear()
+        self.tracked.clear()
+        self.events.clear()
+
+    def add(self, sensor):
+        self.order[sensor] = len(self.order)
+        self.occupants[sensor] = set()
+        self.index.insert(sensor)
+
+    def reset(self):
+        """Olvida quién estaba dentro (los sensores ya se restauraron aparte)"""
+        for inside in self.occupants.values():
+            inside.clear()
+        self.tracked.clear()
+        self.events.clear()
+
+    def update(self, entities):
+        events = self.events
+        events.clear()
+        tracked = self.tracked
+        occupants = self.occupants
+        touched = {} # sensor -> estaba ocupado antes de este update
+
+        for entity in entities:
+            rect = entity.rect
+            pos = (rect.x, rect.y)
+            prev = tracked.get(entity)
+            if prev is not None and prev[0] == pos:
+                continue # No se movió: sigue tocando lo mismo
+
+            inside = self.index.query(rect)
+            old = prev[1] if prev is not None else ()
+            for sensor in old:
+                if sensor not in inside:
+                    if sensor not in touched: touched[sensor] = bool(occupants[sensor])
+                    occupants[sensor].discard(entity)
+                    events.append((entity, sensor, False))
+            for sensor in inside:
+                if sensor not in old:
+                    if sensor not in touched: touched[sensor] = bool(occupants[sensor])
+                    occupants[sensor].add(entity)
+                    events.append((entity, sensor, True))
+            tracked[entity] = (pos, inside)
+
+        # Entidades que ya no están (ecos borrados o reciclados)
+        if len(tracked) > len(entities):
+            current = set(entities)
+            for entity in [e for e in tracked if e not in current]:
+                for sensor in tracked.pop(entity)[1]:
+                    if sensor not in touched: touched[sensor] = bool(occupants[sensor])
+                    occupants[sensor].discard(entity)
+                    events.append((entity, sensor, False))
+
+        if touched:
+            order = self.order
+            for sensor in sorted(touched, key=order.__getitem__):
+                occupied = bool(occupants[sensor])
+                if occupied != touched[sensor]:
+                    sensor.set_activated(occupied)
+        return events
+
+
+class Trigger:
+    """Volumen de disparo sin sprite propio (p. ej. una fila de pinchos).
+
+    Crystal y Portal hacen de trigger ellos mismos: basta con que tengan
+    rect y el atributo 'trigger' con el tipo de evento.
+    """
+    __slots__ = ("trigger", "rect")
+
+    def __init__(self, trigger, rect):
+        self.trigger = trigger  # "damage", "pickup" o "exit"
+        self.rect = rect
+
+
+def merge_hazards(spikes):
+    """Fusiona los pinchos contiguos de la misma fila en un solo Trigger de daño"""
+    merged = []
+    for rect in sorted((s.rect for s in spikes), key=lambda r: (r.top, r.bottom, r.left)):
+        last = merged[-1].rect if merged else None
+        if last and last.top == rect.top and last.bottom == rect.bottom and rect.left <= last.right:
+            last.width = max(last.right, rect.right) - last.left
+        else:
+            merged.append(Trigger("damage", rect.copy()))
+    return merged
@@ -2,7 +2,20 @@
 
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
-FPS = 60
+FPS = 60 # Límite de dibujado (puede ser 120/144, la simulación no cambia)
+
+# Simulación a paso fijo: la física avanza siempre en ticks de 1/SIM_HZ s
+# y el dibujado interpola entre los dos últimos ticks.
+# NO es un ajuste: GRAVITY, SPEED, JUMP_FORCE y la velocidad de los gates
+# están en píxeles por tick y el juego está afinado para 60 ticks/s. Con
+# otro valor cambian la velocidad de todo y los saltos, así que debe
+# quedarse en 60 (para suavizar en pantallas rápidas está FPS).
+SIM_HZ = 60
+SIM_DT = 1 / SIM_HZ
+MAX_FRAME_TIME = 0.25 # Tope por frame para no encadenar ticks tras un tirón
+# En reposo (menús quietos, popup con el nivel parado) no se redibuja y el
+# bucle espera eventos como mucho estos ms antes de volver a mirar
+IDLE_WAIT_MS = 100
 
 # Paleta Cyberpunk
 COLOR_BG = (13, 12, 34)       # Azul casi negro
@@ -16,7 +29,29 @@ GRAVITY = 0.8
 JUMP_FORCE = -16
 SPEED = 5
 MAX_ECHOES = 5
+ECHO_POOL_SIZE = MAX_ECHOES # Ecos (y tomas) que se reciclan en lugar de crearse
 RESONANCE_DIST = 100 # Distancia en píxeles para activar resonancia
+COLLISION_CELL_SIZE = 128 # Tamaño de celda de la rejilla de colisiones
+TOTAL_LEVELS = 5
+
+# Grabación de tomas para los ecos (memoria acotada)
+RECORDING_MAX_SECONDS = 120   # Duración máxima de una toma
+# Qué hacer al llenarse:
+#   "stop"      -> deja de grabar (el eco repite los primeros N segundos)
+#   "keep_last" -> buffer circular, conserva los últimos N segundos
+#   "truncate"  -> descarta de golpe la mitad más antigua y sigue grabando
+RECORDING_OVERFLOW = "keep_last"
+# Qué guarda una toma y cómo la repite el eco:
+#   "positions" -> posición y estado de cada tick; el eco los copia tal cual
+#   "inputs"    -> solo las teclas de cada tick (1 byte); el eco vuelve a
+#                  simular la física, así sube a los ascensores y choca con
+#                  las barreras tal y como estén en su propia pasada
+ECHO_MODE = "positions"
+
+# Entrada del jugador como máscara de bits (una por tick de simulación)
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
 
 # ==========================================
 # LO NUEVO: ESTADOS DEL JUEGO Y UI
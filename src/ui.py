@@ -1,11 +1,21 @@
 import pygame
 from src.settings import *
+from src.assets import AssetManager
 
 class UI:
     def __init__(self, screen):
         self.screen = screen
-        self.font_title = pygame.font.SysFont("Orbitron", 60, bold=True)
-        self.font_button = pygame.font.SysFont("Rajdhani", 30, bold=True)
+
+        # --- CACHÉS ---
+        # Fuentes por (nombre, tamaño, negrita), textos ya renderizados y
+        # versiones ampliadas de los botones para el hover: así los menús no
+        # buscan fuentes ni reescalan imágenes en cada frame.
+        self._fonts = {}
+        self._texts = {}
+        self._hover_images = {}
+
+        self.font_title = self.get_font("Orbitron", 60, bold=True)
+        self.font_button = self.get_font("Rajdhani", 30, bold=True)
         
         print("--- Iniciando carga de UI ---")
         
@@ -33,18 +43,38 @@ class UI:
 
     def safe_load(self, path, size=None):
         try:
-            img = pygame.image.load(path).convert_alpha()
-            if size:
-                img = pygame.transform.scale(img, size)
-            return img
+            return AssetManager.load_image(path, size)
         except FileNotFoundError:
             return None
         except Exception:
             return None
 
+    def get_font(self, name, size, bold=False):
+        key = (name, size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+        return font
+
+    def render_text(self, font, text, color):
+        key = (font, text, color)
+        surface = self._texts.get(key)
+        if surface is None:
+            surface = self._texts[key] = font.render(text, True, color)
+        return surface
+
+    def hover_image(self, image, scale):
+        key = (image, scale)
+        scaled = self._hover_images.get(key)
+        if scaled is None:
+            rect = image.get_rect()
+            new_size = (int(rect.width * scale), int(rect.height * scale))
+            scaled = self._hover_images[key] = pygame.transform.scale(image, new_size)
+        return scaled
+
     def draw_text(self, text, size, x, y, color=COLOR_TEXT):
-        font = pygame.font.SysFont("Arial", size) 
-        surface = font.render(text, True, color)
+        font = self.get_font("Arial", size)
+        surface = self.render_text(font, text, color)
         rect = surface.get_rect(center=(x, y))
         self.screen.blit(surface, rect)
 
@@ -56,8 +86,7 @@ class UI:
         action_triggered = None
         
         if rect.collidepoint(mouse_pos):
-            new_size = (int(rect.width * scale_hover), int(rect.height * scale_hover))
-            final_image = pygame.transform.scale(image, new_size)
+            final_image = self.hover_image(image, scale_hover)
             rect = final_image.get_rect(center=rect.center)
             if clicked:
                 action_triggered = action_code
@@ -67,11 +96,11 @@ class UI:
         # Dibujamos texto encima si se proporciona (útil para números)
         if text:
             # Sombra negra para que se lea mejor sobre cualquier imagen
-            shadow_surf = self.font_button.render(text, True, (0,0,0))
+            shadow_surf = self.render_text(self.font_button, text, (0,0,0))
             shadow_rect = shadow_surf.get_rect(center=(rect.centerx + 2, rect.centery + 2))
             self.screen.blit(shadow_surf, shadow_rect)
             
-            text_surf = self.font_button.render(text, True, COLOR_TEXT)
+            text_surf = self.render_text(self.font_button, text, COLOR_TEXT)
             text_rect = text_surf.get_rect(center=rect.center)
             self.screen.blit(text_surf, text_rect)
             
@@ -90,7 +119,7 @@ class UI:
             if clicked: action_triggered = action_code
 
         pygame.draw.rect(self.screen, color, rect, border_radius=10)
-        text_surf = self.font_button.render(text, True, COLOR_TEXT)
+        text_surf = self.render_text(self.font_button, text, COLOR_TEXT)
         text_rect = text_surf.get_rect(center=rect.center)
         self.screen.blit(text_surf, text_rect)
         return action_triggered
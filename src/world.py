@@ -0,0 +1,438 @@
+import os
+import pygame
+
+from src.settings import *
+from src.echo import EchoSystem, EchoPool
+from src.collision import SpatialHash
+from src.sensors import SensorIndex
+from src.resonance import detect_resonance
+from src.level_manager import LevelManager
+from src.rules import RuleEngine
+
+def init_headless():
+    """Prepara pygame sin ventana ni audio (tests, bots y benchmarks)"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    # convert_alpha() necesita un modo de vídeo, aunque sea falso
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+class Inputs:
+    """Entrada de un tick: teclas mantenidas (máscara) y acciones puntuales"""
+    def __init__(self, move=0, spawn_echo=False, clear_echoes=False, dismiss_popup=False, skip_level=False):
+        self.move = move
+        self.spawn_echo = spawn_echo
+        self.clear_echoes = clear_echoes
+        self.dismiss_popup = dismiss_popup
+        self.skip_level = skip_level
+
+    def clear_actions(self):
+        # Las acciones puntuales se consumen en el primer tick que las ve
+        self.spawn_echo = False
+        self.clear_echoes = False
+        self.dismiss_popup = False
+        self.skip_level = False
+
+    @staticmethod
+    def keys_to_bits(keys):
+        bits = 0
+        if keys[pygame.K_a]: bits |= INPUT_LEFT
+        if keys[pygame.K_d]: bits |= INPUT_RIGHT
+        if keys[pygame.K_w]: bits |= INPUT_JUMP
+        return bits
+
+
+class World:
+    """Toda la lógica de juego de un nivel, sin dibujar nada.
+
+    main.py solo traduce la entrada a Inputs, llama a advance() y dibuja el
+    estado resultante; así la simulación puede correr sin ventana.
+    """
+    def __init__(self, assets=None, total_levels=TOTAL_LEVELS, echo_mode=ECHO_MODE):
+        self.assets = assets
+        self.total_levels = total_levels
+        self.levels = LevelManager() # Niveles declarados en assets/levels/
+
+        # Grupos de Sprites
+        self.all_sprites = pygame.sprite.Group()
+        self.platforms = pygame.sprite.Group()
+        self.crystals = pygame.sprite.Group()
+        self.levers = pygame.sprite.Group()
+        self.gates = pygame.sprite.Group()
+
+        self.level_hazards = [] # Triggers de daño (pinchos contiguos ya fusionados)
+        self.level_barriers = {}
+        self.special_gate = None
+        self.moving_crystal = None
+        self.rules = RuleEngine() # Palancas -> barreras, gates y portal
+
+        # Sólidos activos (plataformas, gates y barreras cerradas)
+        self.colliders = SpatialHash()
+        # Palancas como volúmenes sensores (avisan al entrar/salir)
+        self.sensors = SensorIndex()
+        # Pinchos, cristales y portal: lo que el jugador dispara al tocarlo
+        self.triggers = SpatialHash()
+
+        self.echo_system = EchoSystem(EchoPool(mode=echo_mode))
+        self.echoes = self.echo_system.echoes # Lista viva, la mantiene EchoSystem
+        self.player = None
+        self.res_plat = None
+        self.portal = None
+
+        # Progreso
+        self.current_level = 1
+        self.max_unlocked_level = 1
+
+        # Estado del nivel
+        self.tutorial_step = 0
+        self.show_popup = False
+        self.popup_text = ""
+        self.collected_fragments = 0
+        self.resonance_active = False
+        self.resonance_links = [] # Pares de centros para dibujar las líneas
+        self.resonance_chains = [] # Cadenas de entidades en resonancia (mayor primero)
+        self.tick = 0
+        self.level_serial = 0 # Cambia en cada carga de nivel (el renderer re-hornea)
+        self.settled = False  # En el último tick no se movió nada
+
+        # Paso fijo: tiempo real pendiente de simular y posiciones del tick
+        # anterior (solo de lo que se mueve) para interpolar al dibujar
+        self.accumulator = 0.0
+        self.prev_positions = {}
+
+        # Estado inicial del nivel cargado, para restore() al morir
+        self.snapshot = None
+
+    def reset_level(self, level_id):
+        self.current_level = level_id
+        self.level_serial += 1
+        self.settled = False
+
+        # Memoria que dejan las tomas del nivel que se abandona
+        if self.player:
+            print(f"Memoria de tomas: {self.recording_memory() / 1024:.1f} KB "
+                  f"(techo {self.recording_memory_limit() / 1024:.1f} KB)")
+
+        # Limpieza (los ecos y la toma en curso vuelven a la reserva)
+        pool = self.echo_system.pool
+        self.echo_system.clear()
+        if self.player:
+            pool.release_recording(self.player.recording)
+        pool.prewarm()
+        self.collected_fragments = 0
+
+        self.level_hazards = []
+        self.level_barriers = {}
+        self.special_gate = None
+        self.moving_crystal = None
+        self.resonance_links = []
+        self.resonance_chains = []
+        self.prev_positions.clear()
+
+        # Carga del nivel (compilado y en caché tras la primera vez)
+        self.player, self.portal, self.res_plat, level_data = self.levels.load_level(
+            level_id, self.all_sprites, self.platforms, self.crystals, self.levers, self.gates)
+
+        # Música (después de cargar: load_level ya esperó al prefetch que la lee)
+        if self.assets:
+            self.assets.play_music(f"level_{level_id}")
+        self.player.recording = pool.take_recording()
+
+        if level_data:
+            self.tutorial_step = level_data.get("tutorial_step", 0)
+            self.popup_text = level_data.get("popup_text", "")
+            self.show_popup = level_data.get("show_popup", False)
+            self.moving_crystal = level_data.get("moving_crystal", None)
+            self.level_hazards = level_data.get("hazards", [])
+            self.level_barriers = level_data.get("barriers", {})
+            self.special_gate = level_data.get("moving_gate", None)
+
+        self.build_colliders()
+        self.build_sensors()
+        self.build_triggers()
+        self.rules.load(level_data.get("rules", []) if level_data else [], self.crystals)
+        self.rules.evaluate_all()
+        self.take_snapshot()
+
+        # Mientras se juega este nivel, el siguiente se prepara en segundo plano
+        if level_id < self.total_levels:
+            self.levels.prefetch(level_id + 1, self.assets)
+
+    def build_colliders(self):
+        # Lo estático entra una sola vez. Gates, barreras y plataformas de
+        # resonancia avisan ellos mismos al moverse o (des)activarse, así que
+        # en un tick sin cambios no se toca el conjunto de sólidos.
+        colliders = self.colliders
+        colliders.clear()
+        for sprite in (*self.platforms, *self.gates, *self.level_barriers.values()):
+            sprite.collider_set = colliders
+            if sprite.active: colliders.insert(sprite)
+
+    def build_sensors(self):
+        self.sensors.clear()
+        for lever in self.levers:
+            self.sensors.add(lever)
+
+    def build_triggers(self):
+        # En el orden en que se atienden los de un mismo tipo (el de los grupos)
+        triggers = self.triggers
+        triggers.clear()
+        for trigger in (*self.level_hazards, *self.crystals, self.portal):
+            triggers.insert(trigger)
+
+    def take_snapshot(self):
+        """Guarda el estado mutable del nivel recién cargado (ver restore)"""
+        self.snapshot = (
+            self.all_sprites.sprites(),
+            self.crystals.sprites(),
+            [(s, s.snapshot()) for s in self.all_sprites if hasattr(s, "snapshot")],
+            (self.tutorial_step, self.popup_text, self.show_popup),
+        )
+
+    def restore(self):
+        """Devuelve el nivel a como estaba al cargarlo, sin reconstruir nada.
+
+        Es lo que pasa al morir: los sprites se recolocan en su sitio (y cada
+        uno avisa al SpatialHash si hace falta), los cristales recogidos
+        vuelven en su orden original y los ecos vuelven a la reserva.
+        """
+        sprites, crystals, states, popup = self.snapshot
+
+        self.echo_system.clear()
+        if len(self.crystals) != len(crystals):
+            # Mismo orden de dibujo y de grupo que recién cargado
+            self.all_sprites.empty()
+            self.all_sprites.add(*sprites)
+            self.crystals.empty()
+            self.crystals.add(*crystals)
+
+        for sprite, state in states:
+            sprite.restore(state)
+        self.sensors.reset()
+        self.build_triggers()
+        self.rules.evaluate_all()
+
+        self.tutorial_step, self.popup_text, self.show_popup = popup
+        self.collected_fragments = 0
+        self.resonance_active = False
+        self.resonance_links = []
+        self.resonance_chains = []
+        self.prev_positions.clear()
+        self.settled = False
+
+    def advance_level(self):
+        """Pasa al siguiente nivel. Devuelve "finished" si no quedan niveles."""
+        if self.current_level < self.total_levels:
+            self.reset_level(self.current_level + 1)
+            if self.current_level > self.max_unlocked_level:
+                self.max_unlocked_level = self.current_level
+            return None
+        return "finished"
+
+    # --- ACCIONES DEL JUGADOR ---
+    def dismiss_popup(self):
+        if not self.show_popup:
+            return
+        self.show_popup = False
+        if self.tutorial_step == 1: self.tutorial_step = 0
+        elif self.tutorial_step == 2: self.tutorial_step = 3
+
+    def spawn_echo(self):
+        player = self.player
+        if self.current_level == 1:
+            print("Habilidad bloqueada")
+        elif len(self.echoes) < MAX_ECHOES and self.collected_fragments > 0:
+            self.collected_fragments -= 1
+            # El eco se queda con la toma (sin copiarla) y el jugador empieza
+            # otra; eco y toma nueva salen de la reserva de EchoPool
+            take = player.recording.linearize()
+            new_echo = self.echo_system.spawn(100, SCREEN_HEIGHT - 150, take)
+            self.all_sprites.add(new_echo)
+
+            start_pos = take.start_pos() or (100, 500)
+            player.rect.topleft = start_pos
+            player.set_ground(None)
+            player.recording = self.echo_system.pool.take_recording()
+            player.velocity = pygame.math.Vector2(0, 0)
+        else:
+            print("¡Sin fragmentos!")
+
+    def clear_echoes(self):
+        self.echo_system.clear()
+
+    def recording_memory(self):
+        """Bytes ocupados por la toma actual y las de los ecos"""
+        total = self.player.recording.nbytes if self.player else 0
+        return total + sum(e.recording.nbytes for e in self.echoes)
+
+    def recording_memory_limit(self):
+        """Lo más que pueden ocupar la toma del jugador y las de MAX_ECHOES ecos"""
+        return (MAX_ECHOES + 1) * self.player.recording.max_nbytes if self.player else 0
+
+    # --- SIMULACIÓN ---
+    def advance(self, frame_time, inputs):
+        """Consume frame_time segundos en ticks fijos de SIM_DT.
+
+        Devuelve "finished" si algún tick completó el último nivel.
+        """
+        self.accumulator += min(frame_time, MAX_FRAME_TIME)
+        while self.accumulator >= SIM_DT:
+            self.accumulator -= SIM_DT
+            result = self.step(inputs)
+            inputs.clear_actions()
+            if result:
+                self.accumulator = 0.0
+                return result
+        return None
+
+    def is_idle(self):
+        """Popup abierto y nivel quieto: los ticks siguientes no cambiarían nada.
+
+        Una barrera cerrada sigue pulsando, así que mientras haya alguna no
+        se puede dejar de dibujar.
+        """
+        if not (self.show_popup and self.settled):
+            return False
+        return not any(b.active for b in self.level_barriers.values())
+
+    @property
+    def alpha(self):
+        """Fracción del siguiente tick ya transcurrida (0..1), para interpolar"""
+        return self.accumulator / SIM_DT
+
+    def moving_sprites(self):
+        yield self.player
+        yield from self.echoes
+        yield from self.gates
+        if self.moving_crystal:
+            yield self.moving_crystal
+
+    def render_position(self, sprite, alpha):
+        """Posición de dibujo interpolada entre el tick anterior y el actual"""
+        prev = self.prev_positions.get(sprite)
+        x, y = sprite.rect.topleft
+        if prev is None:
+            return x, y
+        px, py = prev
+        # Teletransportes (respawn, eco nuevo...) no se interpolan
+        if abs(x - px) > 64 or abs(y - py) > 64:
+            return x, y
+        return round(px + (x - px) * alpha), round(py + (y - py) * alpha)
+
+    def step(self, inputs):
+        """Avanza un tick. Devuelve "finished" al completar el último nivel."""
+        self.tick += 1
+
+        prev_positions = self.prev_positions
+        prev_positions.clear()
+        for sprite in self.moving_sprites():
+            prev_positions[sprite] = sprite.rect.topleft
+
+        if inputs.dismiss_popup:
+            self.dismiss_popup()
+
+        if not self.show_popup:
+            if inputs.spawn_echo and self.player:
+                self.spawn_echo()
+            if inputs.clear_echoes:
+                self.clear_echoes()
+            if inputs.skip_level:
+                return self.advance_level()
+
+        if self.tutorial_step == 1 and self.show_popup:
+            if inputs.move & (INPUT_LEFT | INPUT_RIGHT | INPUT_JUMP):
+                self.show_popup = False
+                self.tutorial_step = 0
+
+        player = self.player
+        active_entities = [player] + self.echoes
+
+        self.update_resonance(active_entities)
+        # Las palancas que cambian avisan al RuleEngine, que abre o cierra
+        # barreras, gates y portal; los gates llevan consigo a sus pasajeros
+        self.sensors.update(active_entities)
+        for gate in self.gates:
+            gate.update_position(gate.should_open)
+
+        if self.moving_crystal and self.moving_crystal.alive() and self.special_gate:
+            self.moving_crystal.rect.centerx = self.special_gate.rect.centerx
+            self.moving_crystal.rect.bottom = self.special_gate.rect.top - 10
+            self.triggers.move(self.moving_crystal)
+
+        player.update(self.colliders, inputs.move if not self.show_popup else 0)
+        self.echo_system.step(self.colliders)
+
+        # Con un popup abierto el jugador no se mueve; si tampoco se movió nada
+        # más, main.py puede dejar de simular y dibujar hasta el próximo evento
+        self.settled = self.show_popup and all(
+            prev_positions.get(s) == s.rect.topleft for s in self.moving_sprites())
+
+        if player.rect.y > SCREEN_HEIGHT + 200:
+            self.restore()
+            return None
+
+        return self.check_triggers()
+
+    def update_resonance(self, active_entities):
+        links, chains = detect_resonance(active_entities)
+        self.resonance_links = [(active_entities[i].rect.center, active_entities[j].rect.center) for i, j in links]
+        self.resonance_chains = [[active_entities[i] for i in chain] for chain in chains]
+        self.resonance_active = bool(chains)
+
+        # La plataforma pide una cadena de al menos 'resonance_chain' entidades
+        if self.res_plat:
+            longest = len(chains[0]) if chains else 0
+            self.res_plat.update_resonance(longest >= self.res_plat.resonance_chain)
+
+    def check_triggers(self):
+        """Una sola consulta por todo lo que el jugador toca y dispara.
+
+        Los eventos se atienden por tipo: daño (reinicia y no sigue),
+        recogida de cristales y, por último, salida por el portal.
+        """
+        hits = self.triggers.query(self.player.rect)
+        if not hits:
+            return None
+
+        pickups = []
+        exit_portal = False
+        for trigger in hits:
+            kind = trigger.trigger
+            if kind == "damage":
+                self.restore()
+                return None
+            if kind == "pickup":
+                pickups.append(trigger)
+            elif kind == "exit":
+                exit_portal = True
+
+        if pickups:
+            self.collect_crystals(pickups)
+        if exit_portal:
+            return self.enter_portal()
+        return None
+
+    def collect_crystals(self, crystals):
+        for crystal in crystals:
+            crystal.kill()
+            self.triggers.remove(crystal)
+        self.collected_fragments += len(crystals)
+
+        if self.current_level == 1:
+            if self.tutorial_step == 0:
+                self.tutorial_step = 2
+                self.show_popup = True
+                self.popup_text = "Fragmento de alma adquirido. Júntalos todos para escapar de esta realidad"
+
+        self.rules.crystals_changed()
+
+    def enter_portal(self):
+        # El jugador ya está tocando el portal (evento "exit")
+        if self.portal.active:
+            if self.current_level == self.max_unlocked_level:
+                if self.max_unlocked_level < self.total_levels:
+                    self.max_unlocked_level += 1
+            return self.advance_level()
+
+        return None